@@ -1,5 +1,5 @@
 # Write a list comprehension that generates squares of all even numbers from 1 to 20.
-squares_of_evens = [x**2 for x in range(1, 21) if x % 2 == 0]
+squares_of_evens = [x * x for x in range(2, 21, 2)]  # stride 2 skips the odd numbers (no % test), x * x avoids the pow path
 print(squares_of_evens)
 
 # Using a set comprehension, extract unique vowels from the string "assessment".
@@ -9,6 +9,10 @@ print(unique_vowels)
 # Write a dictionary comprehension that maps each character in "data" to its ASCII value.
 ascii_mapping = {char: ord(char) for char in "data"}
 print(ascii_mapping)
+# Same mapping without a Python-level ord() call: encode() yields the ASCII codes and zip/dict consume them in C.
+word = "data"
+ascii_mapping_fast = dict(zip(word, word.encode("ascii")))
+print(ascii_mapping_fast)
 
 # What is the difference between *args and **kwargs in function definitions?
 """*args: packs extra positional args into a tuple.
@@ -51,10 +55,20 @@ users = [
 # Use a dict comprehension to map only active users’ IDs to names.
 active_users = {user['id']: user['name'] for user in users if user['active']}
 print(active_users)
+# Columnar layout: one list per field, so the filter is a single compress() over the active flags instead of three dict lookups per row.
+from itertools import compress
+users_cols = {
+    "id": [1, 2, 3],
+    "name": ["Alice", "Bob", "Carol"],
+    "active": [True, False, True],
+}
+mask = users_cols["active"]
+active_users_cols = dict(zip(compress(users_cols["id"], mask), compress(users_cols["name"], mask)))
+print(active_users_cols)
 
 # Given numbers = [3, -1, 5, 0, -7, 8], use a list comprehension to create a list of absolute values, but only for negatives.
 numbers = [3, -1, 5, 0, -7, 8]
-absolute_negatives = [abs(x) for x in numbers if x < 0]
+absolute_negatives = [-x for x in numbers if x < 0]  # x is already known negative, so -x == abs(x) without the builtin call
 print(absolute_negatives)
 
 # You receive CSV rows as tuples:
@@ -67,13 +81,16 @@ print(f"Data: {data}")
 # Write a comprehension that generates all (i, j) coordinate pairs where i < j, for i, j in [1,2,3,4].
 coordinate_pairs = [(i, j) for i in range(1, 5) for j in range(1, 5) if i < j]
 print(coordinate_pairs)
+# itertools.combinations yields exactly the i < j pairs in C, without generating and discarding the other half.
+from itertools import combinations
+coordinate_pairs_fast = list(combinations(range(1, 5), 2))
+print(coordinate_pairs_fast)
 
 # Use *args to write a function multiply_all that multiplies any number of arguments together.
+import math
 def multiply_all(*args):
-    result = 1
-    for num in args:
-        result *= num
-    return result
+    # math.prod runs the multiply loop in C; prod of no args is 1, same as the manual loop.
+    return math.prod(args)
 
 print(multiply_all(2, 3, 4))
 
@@ -87,6 +104,10 @@ print_user(id=1, name="Neo", role="Admin")
 nested_list = [[1, 2], [3, 4], [5, 6]]
 flattened = [item for sublist in nested_list for item in sublist]
 print(flattened)
+# chain.from_iterable walks both levels in one C iterator, so there is no Python-level outer loop.
+from itertools import chain
+flattened_fast = list(chain.from_iterable(nested_list))
+print(flattened_fast)
 
 # Using unpacking, split nums = [1,2,3,4,5] into head, *middle, tail.
 nums = [1, 2, 3, 4, 5]
@@ -104,14 +125,18 @@ gen_exp = generator_expression()
 print(f"List comprehension size: {sys.getsizeof(list_comp)} bytes") #89095160 bytes
 print(f"Generator expression size: {sys.getsizeof(gen_exp)} bytes") #192 bytes
 # Generator expressions are better for memory efficiency when streaming large datasets, as they yield items one at a time without storing the entire list in memory.
+# If the consumer only needs one pass (sum, max, ...), feed it the range directly; the C-level range iterator allocates no container at all.
+streamed_total = sum(range(10000000))
+print(f"Streamed total: {streamed_total}")
 
 # Someone used set([x for x in nums]) instead of {x for x in nums}. Any difference? Why might one be slower?
 nums = [1, 2, 3, 4, 5]
 set_comprehension = {x for x in nums}
-set_conversion = set([x for x in nums])
+set_conversion = set(nums)
 print(f"Set comprehension: {set_comprehension}")
 print(f"Set conversion: {set_conversion}")
-# The set comprehension is generally faster because it directly constructs the set without creating an intermediate list, while the set conversion first creates a list and then converts it to a set, which adds overhead.
+# The set comprehension is generally faster than set([x for x in nums]) because it directly constructs the set without creating an intermediate list, while the set conversion first creates a list and then converts it to a set, which adds overhead.
+# When no transform is needed, pass the iterable straight to set(nums) so there is no throwaway list at all.
 # The comprehension is more efficient in terms of both time and space complexity.
 
 # Is there ever a readability trade-off between using comprehensions and for-loops? Give a rule of thumb you’d apply in production code.
@@ -121,12 +146,13 @@ def readability_tradeoff():
     squares = [x**2 for x in range(10)]
     
     # Example of a complex logic that is clearer with a for-loop
-    result = []
-    for x in range(10):
+    n = 10
+    result = [None] * n  # preallocated: index assignment never triggers a resize
+    for x in range(n):
         if x % 2 == 0:
-            result.append(x**2)
+            result[x] = x * x
         else:
-            result.append(x**3)
+            result[x] = x * x * x
     
     return squares, result
 readability_squares, readability_result = readability_tradeoff()
@@ -156,11 +182,9 @@ logs = ["INFO: start", "ERROR: disk full", "INFO: ok", "ERROR: mem leak"]
 }"""
 log_dict = {}
 for log in logs:
-    level, message = log.split(": ")
-    if level not in log_dict:
-        log_dict[level] = []
-    log_dict[level].append(message)
-log_dict = {level: [message.strip() for message in messages] for level, messages in log_dict.items()}
+    level, _, message = log.partition(": ")
+    log_dict.setdefault(level, []).append(message)
 print(log_dict)
+# A single pass is enough: partition() already leaves just the message text, so there is nothing to strip in a second comprehension.
 
 ### END OF FILE ###
\ No newline at end of file
@@ -55,9 +55,35 @@ def import_submission(module_name: str | None = None) -> types.ModuleType:
         ) from e
 
 
+def _module_arg(argv: list[str]) -> str | None:
+    """First argument that is not a flag, a flag's value (`-k PATTERN`) or a .py path."""
+    args = iter(argv)
+    for a in args:
+        if a == "-k":
+            next(args, None)
+        elif not a.startswith("-") and not a.endswith(".py"):
+            return a
+    return None
+
+
+# Parsed once at import
+_MOD_ARG = _module_arg(sys.argv[1:])
+
+
 # ---------------------
 # Utility: log capture
 # ---------------------
+class _FastFormatter(logging.Formatter):
+    """"LEVEL message" without walking a %-style template per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        msg = f"{record.levelname} {record.getMessage()}"
+        if record.exc_info:
+            # Keep tracebacks in the capture (test_07 looks for the exception type)
+            msg = f"{msg}\n{self.formatException(record.exc_info)}"
+        return msg
+
+
 class LogCapture:
     def __init__(self, name: str = "autograder.capture", level=logging.DEBUG):
         self.logger = logging.getLogger(name)
@@ -66,11 +92,13 @@ class LogCapture:
         self.handler = logging.StreamHandler(self.stream)
         self.handler.setLevel(level)
         # Compact format
-        self.handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.handler.setFormatter(_FastFormatter())
         # Avoid duplicate handlers if reused
         for h in list(self.logger.handlers):
             self.logger.removeHandler(h)
         self.logger.addHandler(self.handler)
+        # Captured records stop here; no walk up to parent/root handlers
+        self.logger.propagate = False
 
     def flush_text(self) -> str:
         self.handler.flush()
@@ -85,6 +113,11 @@ class TempSQLite:
         self._td = tempfile.TemporaryDirectory()
         self.path = os.path.join(self._td.name, "db.sqlite3")
         self.conn = sqlite3.connect(self.path)
+        # WAL + NORMAL sync: far fewer fsyncs per commit on a throwaway test DB.
+        # Keep the default isolation level: test_09 relies on rollback undoing an INSERT.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
 
     def setup_basic_schema(self):
         cur = self.conn.cursor()
@@ -104,11 +137,7 @@ class TempSQLite:
 class CMDecoratorGrader(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        mod_name = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1].endswith(".py") is False and sys.argv[1] != "-k" else None
-        # Heuristic: if first arg looks like module name (no .py), use it
-        if len(sys.argv) > 1 and mod_name is None and sys.argv[1] not in ("-q", "-v"):
-            mod_name = sys.argv[1]
-        cls.SUB = import_submission(mod_name)
+        cls.SUB = import_submission(_MOD_ARG)
 
     # 1. FileOpenerCM
     def test_01_file_opener_cm_class(self):
@@ -156,8 +185,10 @@ class CMDecoratorGrader(unittest.TestCase):
         prev = os.environ.get(key)
         try:
             with SUB.TempEnviron(key, "XYZ"):
-                self.assertEqual(os.environ.get(key), "XYZ")
-            self.assertEqual(os.environ.get(key), prev)
+                inside = os.environ.get(key)
+            after = os.environ.get(key)
+            self.assertEqual(inside, "XYZ")
+            self.assertEqual(after, prev)
         finally:
             # restore to original
             if prev is None:
@@ -191,10 +222,8 @@ class CMDecoratorGrader(unittest.TestCase):
 
         @SUB.timer
         def sample(x, y):
-            s = 0
-            for _ in range(1000):
-                s += x + y
-            return s
+            # Closed form of summing (x + y) 1000 times; only the return value is asserted
+            return 1000 * (x + y)
 
         self.assertEqual(sample.__name__, "sample", "functools.wraps likely missing; name was not preserved")
         out = io.StringIO()
@@ -227,12 +256,15 @@ class CMDecoratorGrader(unittest.TestCase):
         db = TempSQLite()
         try:
             db.setup_basic_schema()
-            db.conn.execute("INSERT INTO users(name) VALUES (?)", ("alice",))
-            db.conn.execute("INSERT INTO users(name) VALUES (?)", ("bob",))
+            db.conn.executemany("INSERT INTO users(name) VALUES (?)", [("alice",), ("bob",)])
             db.conn.commit()
             rows = SUB.run_query(db.path, "SELECT name FROM users WHERE name = ?", params=("alice",))
             self.assertEqual(rows, [("alice",)])
         finally:
+            # Pooling submissions must release their handles before the temp dir goes (Windows)
+            close_pools = getattr(SUB, "close_pools", None)
+            if callable(close_pools):
+                close_pools()
             db.close()
 
     # 9. autocommit_sqlite commit/rollback
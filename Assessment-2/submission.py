@@ -4,6 +4,7 @@ Stdlib-only; pragmatic, battle-tested patterns for context managers & decorators
 """
 from __future__ import annotations
 
+import atexit
 import functools
 import logging
 import os
@@ -11,9 +12,18 @@ import random
 import sqlite3
 import threading
 import time
+from collections import OrderedDict, deque
 from contextlib import contextmanager
+from sqlite3 import OperationalError as _OpErr
 from typing import Any, Callable, Iterable, Optional
 
+# Default ns clock for Timer/timer/db_guardrail; override per use with clock=
+_clock: Callable[[], int] = time.perf_counter_ns
+
+# Default loggers resolved once at import, not on every decoration
+_DEFAULT_CATCH_LOG = logging.getLogger("submission.catch_and_log")
+_DEFAULT_GUARD_LOG = logging.getLogger("submission.db_guardrail")
+
 # -------------------------------------------------------------
 # 1) Class-based file context manager
 # -------------------------------------------------------------
@@ -26,6 +36,8 @@ class FileOpenerCM:
     Guarantees close on all paths; never suppresses exceptions.
     """
 
+    __slots__ = ("_path", "_mode", "_kwargs", "_fh")
+
     def __init__(self, path: str, mode: str = "r", **kwargs):
         self._path = path
         self._mode = mode
@@ -57,11 +69,7 @@ def file_opener_cm(path: str, mode: str = "r", **kwargs):
     try:
         yield fh
     finally:
-        try:
-            fh.close()
-        except Exception:
-            # Best-effort close; do not mask original errors
-            pass
+        fh.close()
 
 
 # -------------------------------------------------------------
@@ -69,7 +77,12 @@ def file_opener_cm(path: str, mode: str = "r", **kwargs):
 # -------------------------------------------------------------
 
 
+_MISSING = object()
+
+
 class TempEnviron:
+    __slots__ = ("var", "value", "_prev", "_had_prev")
+
     def __init__(self, var: str, value: Optional[str]):
         self.var = var
         self.value = value
@@ -77,10 +90,14 @@ class TempEnviron:
         self._had_prev = False
 
     def __enter__(self):
-        self._prev = os.environ.get(self.var)
-        self._had_prev = self.var in os.environ
+        # One environ probe; the sentinel distinguishes "unset" from any real value
+        prev = os.environ.get(self.var, _MISSING)
+        self._had_prev = prev is not _MISSING
+        self._prev = None if prev is _MISSING else prev
         if self.value is None:
-            os.environ.pop(self.var, None)
+            # Already unset: nothing to pop
+            if self._had_prev:
+                os.environ.pop(self.var, None)
         else:
             os.environ[self.var] = self.value
         return self
@@ -99,6 +116,8 @@ class TempEnviron:
 
 
 class Locked:
+    __slots__ = ("_lock", "_timeout", "_acquired")
+
     def __init__(self, lock: threading.Lock, timeout: Optional[float] = None):
         self._lock = lock
         self._timeout = timeout
@@ -106,20 +125,20 @@ class Locked:
 
     def __enter__(self):
         if self._timeout is None:
+            # No args: "-1 = forever" is a threading convention (multiprocessing clamps it to 0)
             self._acquired = self._lock.acquire()
         else:
-            # Py>=3.2 supports float timeout
-            self._acquired = self._lock.acquire(timeout=self._timeout)
+            # Positional (blocking, timeout) – no kwargs dict
+            self._acquired = self._lock.acquire(True, self._timeout)
         if not self._acquired:
             raise TimeoutError("Failed to acquire lock within timeout")
         return self._lock
 
     def __exit__(self, exc_type, exc, tb) -> bool:
         if self._acquired:
-            try:
-                self._lock.release()
-            finally:
-                self._acquired = False
+            # Releasing a lock we hold cannot raise
+            self._acquired = False
+            self._lock.release()
         return False
 
 
@@ -129,48 +148,71 @@ class Locked:
 
 
 class Timer:
-    def __init__(self):
-        self.start = None  # type: Optional[float]
-        self.elapsed = 0.0
+    """Integer-ns timing; `.elapsed` (seconds) is derived on read."""
+
+    __slots__ = ("_clock", "_t0", "elapsed_ns")
+
+    def __init__(self, clock: Optional[Callable[[], int]] = None):
+        self._clock = clock or _clock
+        self._t0 = None  # type: Optional[int]
+        self.elapsed_ns = 0
 
     def __enter__(self):
-        self.start = time.perf_counter()
+        self._t0 = self._clock()
         return self
 
     def __exit__(self, exc_type, exc, tb) -> bool:
-        end = time.perf_counter()
-        self.elapsed = float(end - (self.start or end))
+        # Exit without a matching enter measures nothing (0.0), as before
+        self.elapsed_ns = 0 if self._t0 is None else self._clock() - self._t0
         return False
 
+    @property
+    def elapsed(self) -> float:
+        return self.elapsed_ns * 1e-9
+
+    @property
+    def start(self) -> Optional[float]:
+        # Kept for callers of the old float attribute: entry timestamp in seconds
+        return None if self._t0 is None else self._t0 * 1e-9
+
 
 # -------------------------------------------------------------
 # 6) timer – function timer decorator (stdout by default; logger optional)
 # -------------------------------------------------------------
 
 
-def timer(func: Optional[Callable] = None, *, logger: Optional[logging.Logger] = None, level: Optional[int] = None):
+def timer(
+    func: Optional[Callable] = None,
+    *,
+    logger: Optional[logging.Logger] = None,
+    level: Optional[int] = None,
+    clock: Optional[Callable[[], int]] = None,
+):
     """Decorator usable as `@timer` or `@timer(logger=...)`.
 
     Prints to stdout by default to satisfy autograder capture. If a logger is
     provided, logs to that logger at the chosen level (INFO default).
+    `clock` is any int-nanosecond clock (default: module `_clock`).
     """
 
     def _decorator(f: Callable):
         log = logger
         lvl = level if level is not None else logging.INFO
+        fname = getattr(f, "__name__", repr(f))  # partials / callable objects have no __name__
+        now_ns = clock or _clock
 
         @functools.wraps(f)
         def _wrapped(*args, **kwargs):
-            t0 = time.perf_counter()
+            t0 = now_ns()
             try:
                 return f(*args, **kwargs)
             finally:
-                dt = time.perf_counter() - t0
-                msg = f"{f.__name__} elapsed_ms={dt * 1000:.3f}"
+                elapsed_ms = (now_ns() - t0) / 1_000_000
                 if log is not None:
-                    log.log(lvl, msg)
+                    # Lazy %-args: no string is built if the level is filtered out
+                    log.log(lvl, "%s elapsed_ms=%.3f", fname, elapsed_ms)
                 else:
-                    print(msg)
+                    print(f"{fname} elapsed_ms={elapsed_ms:.3f}")
 
         return _wrapped
 
@@ -186,7 +228,7 @@ def timer(func: Optional[Callable] = None, *, logger: Optional[logging.Logger] =
 
 def catch_and_log(func: Optional[Callable] = None, *, logger: Optional[logging.Logger] = None, reraise: bool = True):
     def _decorator(f: Callable):
-        log = logger or logging.getLogger("submission.catch_and_log")
+        log = logger or _DEFAULT_CATCH_LOG
 
         @functools.wraps(f)
         def _wrapped(*args, **kwargs):
@@ -207,24 +249,131 @@ def catch_and_log(func: Optional[Callable] = None, *, logger: Optional[logging.L
 
 
 # -------------------------------------------------------------
-# 8) run_query – safe binding; returns list of tuples
+# 8) run_query – safe binding over pooled connections; returns list of tuples
 # -------------------------------------------------------------
 
 
-def run_query(db_path: str, sql: str, params: Optional[Iterable[Any]] = None):
-    # Use connection CM to commit/rollback per PEP 343 semantics in sqlite3
-    params = tuple(params or ())
-    with sqlite3.connect(db_path) as conn:
-        cur = conn.cursor()
+class _Pool:
+    __slots__ = ("ident", "conns")
+
+    def __init__(self, ident: Optional[tuple]):
+        self.ident = ident  # (st_dev, st_ino) of the file the pooled connections have open
+        self.conns: deque = deque()
+
+
+def _file_ident(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+_POOL_SIZE = 8  # idle connections kept per database
+_MAX_POOLS = 16  # databases kept pooled; least recently used is closed first
+_POOLS: OrderedDict[str, _Pool] = OrderedDict()
+_POOLS_LOCK = threading.Lock()
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    # Autocommit mode: each statement commits on its own, like the old `with conn:` per call.
+    # timeout= installs SQLite's busy handler, so lock contention is waited out in C
+    # instead of surfacing as OperationalError for the Python retry loop.
+    # check_same_thread=False is safe: _borrow hands a connection to one caller at a time.
+    conn = sqlite3.connect(
+        db_path, timeout=5.0, check_same_thread=False, isolation_level=None, cached_statements=256
+    )
+    # journal_mode and synchronous are left at the caller's settings: journal_mode is
+    # persistent in their file, and synchronous=NORMAL is only corruption-safe under WAL
+    return conn
+
+
+def close_pools() -> None:
+    """Close every pooled connection (registered with atexit; call before deleting a db)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        for conn in pool.conns:
+            conn.close()
+
+
+atexit.register(close_pools)
+
+
+@contextmanager
+def _borrow(db_path: str):
+    """Check a connection out of the per-database LIFO pool; return it on success, drop it on error."""
+    if db_path in ("", ":memory:"):
+        # Private per-connection databases: pooling would leak state between calls
+        conn = _connect(db_path)
         try:
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-            return rows
+            yield conn
         finally:
-            try:
-                cur.close()
-            except Exception:
-                pass
+            conn.close()
+        return
+    # Absolute key: a later chdir must not alias a different file
+    key = os.path.abspath(db_path)
+    ident = _file_ident(key)
+    stale: list = []
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is not None and pool.ident != ident:
+            # File was deleted/replaced (or never existed when pooled): old handles are stale
+            stale.extend(pool.conns)
+            pool = None
+        if pool is None:
+            pool = _POOLS[key] = _Pool(ident)
+        _POOLS.move_to_end(key)
+        while len(_POOLS) > _MAX_POOLS:
+            _, evicted = _POOLS.popitem(last=False)
+            stale.extend(evicted.conns)
+        conn = pool.conns.pop() if pool.conns else None
+    for old in stale:
+        old.close()
+    if conn is None:
+        conn = _connect(key)
+    try:
+        yield conn
+    except BaseException:
+        # May be broken or mid-transaction – never hand it to the next caller
+        conn.close()
+        raise
+    if conn.in_transaction:
+        # Caller left a BEGIN open: a pooled copy would sit on the write lock
+        conn.rollback()
+        conn.close()
+        return
+    new_ident = _file_ident(key) if pool.ident is None else None
+    with _POOLS_LOCK:
+        if pool.ident is None:
+            # connect() just created the file
+            pool.ident = new_ident
+        if _POOLS.get(key) is pool and len(pool.conns) < _POOL_SIZE:
+            pool.conns.append(conn)
+            return
+    conn.close()
+
+
+def run_query(db_path: str, sql: str, params: Optional[Iterable[Any]] = None):
+    params = tuple(params or ())
+    with _borrow(db_path) as conn:
+        # Connection.execute creates and steps the cursor in one call; fetchall exhausts it
+        return conn.execute(sql, params).fetchall()
+
+
+def run_many(db_path: str, sql: str, param_rows: Iterable[Iterable[Any]]) -> int:
+    """executemany in one transaction on one pooled connection; returns rows affected."""
+    with _borrow(db_path) as conn:
+        with begin_immediate(conn):
+            cur = conn.executemany(sql, param_rows)
+        return cur.rowcount
+
+
+def run_query_many(db_path: str, sql: str, params_seq: Iterable[Iterable[Any]]):
+    """run_query for each parameter set, reusing a single pooled connection."""
+    with _borrow(db_path) as conn:
+        return [conn.execute(sql, tuple(p or ())).fetchall() for p in params_seq]
 
 
 # -------------------------------------------------------------
@@ -232,6 +381,23 @@ def run_query(db_path: str, sql: str, params: Optional[Iterable[Any]] = None):
 # -------------------------------------------------------------
 
 
+def connect_autocommit(path: str) -> sqlite3.Connection:
+    """Connection in SQLite autocommit mode – pairs with autocommit_sqlite / begin_immediate."""
+    return sqlite3.connect(path, isolation_level=None, timeout=5.0)
+
+
+@contextmanager
+def begin_immediate(conn: sqlite3.Connection):
+    """Explicit write transaction; IMMEDIATE takes the write lock up front (no upgrade deadlock)."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
 def autocommit_sqlite(func: Callable):
     @functools.wraps(func)
     def _wrapped(conn: sqlite3.Connection, *args, **kwargs):
@@ -254,14 +420,23 @@ def autocommit_sqlite(func: Callable):
 # -------------------------------------------------------------
 
 
-def retry_on_operational_error(*, retries: int = 3, backoff: float = 0.01, jitter: bool = False):
+def retry_on_operational_error(
+    *, retries: int = 3, backoff: float = 0.01, jitter: bool = False, max_delay: Optional[float] = None
+):
     """Retry on sqlite3.OperationalError.
 
     `retries` is the total number of attempts, not (failures + 1).
-    Backoff is exponential: backoff * 2**(attempt-1), with optional uniform jitter.
+    Backoff is exponential: backoff * 2**(attempt-1), capped at `max_delay`
+    when given (default: no cap); with `jitter`, the sleep is drawn uniformly
+    from [0, delay) ("full jitter").
     """
 
     def _decorator(func: Callable):
+        # Resolved once per decoration; _wrapped reads them as closure cells
+        op_err = _OpErr
+        sleep = time.sleep
+        rand = random.random
+
         @functools.wraps(func)
         def _wrapped(*args, **kwargs):
             attempt = 0
@@ -269,15 +444,16 @@ def retry_on_operational_error(*, retries: int = 3, backoff: float = 0.01, jitte
                 attempt += 1
                 try:
                     return func(*args, **kwargs)
-                except sqlite3.OperationalError:
+                except op_err:
                     if attempt >= retries:
                         # Exhausted
                         raise
-                    # Sleep with exponential backoff
-                    sleep_for = backoff * (2 ** (attempt - 1))
-                    if jitter:
-                        sleep_for += random.uniform(0, backoff)
-                    time.sleep(sleep_for)
+                    # Sleep with capped exponential backoff
+                    # Exponent clamped: 2**1024 would overflow the float multiply on long retry runs
+                    delay = backoff * (1 << min(attempt - 1, 62))
+                    if max_delay is not None:
+                        delay = min(max_delay, delay)
+                    sleep(rand() * delay if jitter else delay)
 
         return _wrapped
 
@@ -295,42 +471,61 @@ def db_guardrail(
     logger: Optional[logging.Logger] = None,
     retries: int = 2,
     backoff: float = 0.01,
+    jitter: bool = False,
+    max_delay: Optional[float] = None,
+    clock: Optional[Callable[[], int]] = None,
 ):
     """One-stop decorator for DB calls.
 
-    - Retries sqlite3.OperationalError (total attempts == retries)
+    - Retries sqlite3.OperationalError (total attempts == retries), with the
+      same optionally capped / full-jitter backoff as retry_on_operational_error
     - Logs exceptions with stack trace
-    - Emits timing metrics (ms)
+    - Emits timing metrics (ms), measured with `clock` (int ns; default `_clock`)
     """
 
-    log = logger or logging.getLogger("submission.db_guardrail")
+    log = logger or _DEFAULT_GUARD_LOG
 
     def _decorator(f: Callable):
+        # Resolved once per decoration; _wrapped reads them as closure cells
+        op_err = _OpErr
+        sleep = time.sleep
+        rand = random.random
+        perf_ns = clock or _clock
+        log_info = log.info
+        fname = getattr(f, "__name__", repr(f))  # partials / callable objects have no __name__
+
         @functools.wraps(f)
         def _wrapped(*args, **kwargs):
             attempt = 0
-            t0 = time.perf_counter()
-            while True:
-                attempt += 1
-                try:
-                    result = f(*args, **kwargs)
-                    return result
-                except sqlite3.OperationalError as e:
-                    if attempt >= retries:
-                        log.exception("OperationalError in %s after %d attempt(s): %s", f.__name__, attempt, e)
+            t0 = perf_ns()
+            try:
+                while True:
+                    attempt += 1
+                    try:
+                        result = f(*args, **kwargs)
+                        return result
+                    except op_err as e:
+                        if attempt >= retries:
+                            log.exception("OperationalError in %s after %d attempt(s): %s", fname, attempt, e)
+                            raise
+                        # Log and backoff, then retry
+                        if log.isEnabledFor(logging.INFO):
+                            log_info("retry attempt=%d for %s due to OperationalError: %s", attempt, fname, e)
+                        # Exponent clamped: 2**1024 would overflow the float multiply on long retry runs
+                        delay = backoff * (1 << min(attempt - 1, 62))
+                        if max_delay is not None:
+                            delay = min(max_delay, delay)
+                        sleep(rand() * delay if jitter else delay)
+                    except Exception as e:
+                        # Non-retriable
+                        log.exception("Exception in %s: %s", fname, e)
                         raise
-                    # Log and backoff, then retry
-                    log.info("retry attempt=%d for %s due to OperationalError: %s", attempt, f.__name__, e)
-                    time.sleep(backoff * (2 ** (attempt - 1)))
-                except Exception as e:
-                    # Non-retriable
-                    log.exception("Exception in %s: %s", f.__name__, e)
-                    raise
-                finally:
-                    # On every loop/exit, emit elapsed so far; final call will reflect total
-                    dt = time.perf_counter() - t0
+            finally:
+                # One timing record per call, covering all attempts
+                if log.isEnabledFor(logging.INFO):
+                    elapsed_ms = (perf_ns() - t0) / 1_000_000
                     # Keep it simple/compact for autograder token checks
-                    log.info("%s elapsed_ms=%.3f", f.__name__, dt * 1000.0)
+                    log_info("%s elapsed_ms=%.3f", fname, elapsed_ms)
 
         return _wrapped
 